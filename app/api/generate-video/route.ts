@@ -3,6 +3,8 @@ import { IVideoGenerationRequest } from '@/types';
 
 const MAX_RETRIES = 3;
 const INITIAL_DELAY = 1000;
+// 취소되었거나 새 요청으로 대체된 작업 (재시도하지 않음)
+const CANCELLED_STATUS = 409;
 
 // 지연 함수
 const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
@@ -16,23 +18,40 @@ export async function POST(req: Request) {
         for (let i = 0; i < MAX_RETRIES; i++) {
             try {
                 // 프록시 라우트를 통해 FastAPI 서버 호출
+                // 클라이언트 연결이 끊기면 백엔드 요청도 중단되도록 signal 전달
                 const response = await fetch('/api/python/generate-video', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
                     },
                     body: JSON.stringify(body),
+                    signal: req.signal,
                 });
 
                 const data = await response.json();
                 console.log('FastAPI 응답:', data);
 
+                if (response.status === CANCELLED_STATUS) {
+                    return NextResponse.json(
+                        {
+                            error: data.detail || '비디오 생성이 취소되었습니다.',
+                            cancelled: true,
+                        },
+                        { status: CANCELLED_STATUS }
+                    );
+                }
+
                 if (!response.ok) {
                     throw new Error(data.detail || '비디오 생성에 실패했습니다.');
                 }
 
                 return NextResponse.json(data);
             } catch (error: any) {
+                // 클라이언트가 요청을 중단한 경우 재시도하지 않음
+                if (req.signal.aborted || error.name === 'AbortError') {
+                    throw error;
+                }
+
                 console.error(`시도 ${i + 1}/${MAX_RETRIES} 실패:`, error);
                 lastError = error;
 
@@ -34,6 +34,8 @@ async function proxyRequest(request: NextRequest) {
             method: request.method,
             headers,
             body: request.body,
+            // 클라이언트 연결이 끊기면 FastAPI 요청도 중단
+            signal: request.signal,
         });
 
         // FastAPI 서버의 응답을 그대로 반환
@@ -18,8 +18,28 @@ os.environ["OPENCV_OPENCL_DEVICE"] = ":GPU:0"
 VIDEO_WIDTH = 1080
 VIDEO_HEIGHT = 1920
 VIDEO_FPS = 24
+VIDEO_CODEC = "h264_videotoolbox"
+AUDIO_CODEC = "aac"
+AUDIO_FPS = 44100
 
 # 자막 설정
 SUBTITLE_BASE_FONTSIZE = 70
 SUBTITLE_BASE_STROKE_WIDTH = 4.0
 SUBTITLE_FONT = "Helvetica-Bold"
+
+# 내레이션 분석 설정
+# 분석 캐시는 정적 파일로 제공되지 않는 폴더에 저장
+AUDIO_CACHE_DIR = os.path.join("cache", "audio_analysis")
+AUDIO_CACHE_MAX_ENTRIES = 200
+AUDIO_ANALYSIS_SAMPLE_RATE = 16000
+AUDIO_ANALYSIS_HOP = 0.01  # RMS 프레임 간격 (초)
+SILENCE_THRESHOLD_DB = -35.0  # 최대 RMS 대비 무음 판정 기준
+MIN_PAUSE_DURATION = 0.2
+MIN_SCENE_DURATION = 1.0
+
+# 장면 처리 워커 설정 (1 이하이면 프로세스 내에서 처리)
+SCENE_WORKERS = int(os.environ.get("SCENE_WORKERS", "0"))
+FRAME_STORE_DIRNAME = "frames"
+
+# 작업 제한 시간 (초)
+JOB_TIMEOUT = float(os.environ.get("JOB_TIMEOUT", "1800"))
@@ -1,9 +1,15 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import os
+import uuid
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from .core.config import UPLOAD_DIR
+from .core.config import JOB_TIMEOUT, UPLOAD_DIR
 from .models.video import VideoRequest
+from .services.job_control import JobCancelled, job_registry
 from .services.video_generator import VideoGenerator
 
 app = FastAPI()
@@ -21,12 +27,28 @@ app.add_middleware(
 app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 
+async def watch_disconnect(http_request: Request, token):
+    """클라이언트 연결이 끊기면 작업 취소"""
+    while not token.cancelled:
+        if await http_request.is_disconnected():
+            token.cancel("cancelled because the client disconnected")
+            return
+        await asyncio.sleep(1)
+
+
 @app.post("/generate-video")
-async def generate_video(request: VideoRequest):
+async def generate_video(request: VideoRequest, http_request: Request):
     """비디오 생성 엔드포인트"""
+    # 같은 프로젝트의 이전 작업은 취소되고, 작업마다 별도 임시 폴더 사용
+    token = job_registry.start(request.projectId, JOB_TIMEOUT)
+    watcher = asyncio.create_task(watch_disconnect(http_request, token))
+    temp_dir = os.path.join("temp", f"{request.projectId}_{uuid.uuid4().hex[:8]}")
     try:
-        generator = VideoGenerator(request)
-        return generator.generate()
+        generator = VideoGenerator(request, temp_dir=temp_dir, cancel_token=token)
+        return await run_in_threadpool(generator.generate)
+    except JobCancelled as e:
+        print(f"Video generation cancelled: {str(e)}")
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         print(f"Error in generate_video: {str(e)}")
         import traceback
@@ -35,6 +57,15 @@ async def generate_video(request: VideoRequest):
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        watcher.cancel()
+        job_registry.finish(request.projectId, token)
+
+
+@app.post("/generate-video/{project_id}/cancel")
+async def cancel_video(project_id: str):
+    """실행 중인 비디오 생성 작업 취소"""
+    return {"cancelled": job_registry.cancel(project_id)}
 
 
 @app.get("/health")
@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
 
 
 class Subtitle(BaseModel):
@@ -9,9 +9,54 @@ class Subtitle(BaseModel):
     index: int
 
 
+class Rendition(BaseModel):
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+
+    @field_validator("width", "height")
+    @classmethod
+    def check_even(cls, value: int) -> int:
+        # yuv420p 인코딩은 짝수 해상도만 지원
+        if value % 2:
+            raise ValueError("rendition width and height must be even")
+        return value
+
+
+class ThumbnailSpec(BaseModel):
+    posterTime: float = Field(default=0.0, ge=0)
+    spriteInterval: float = Field(default=1.0, gt=0)
+    spriteColumns: int = Field(default=5, gt=0)
+    spriteWidth: int = Field(default=180, gt=0)
+
+
+class OutputSpec(BaseModel):
+    renditions: List[Rendition] = Field(
+        default=[
+            Rendition(width=1080, height=1920),
+            Rendition(width=720, height=1280),
+            Rendition(width=480, height=854),
+        ],
+        min_length=1,
+    )
+    thumbnails: Optional[ThumbnailSpec] = ThumbnailSpec()
+
+    @field_validator("renditions")
+    @classmethod
+    def check_unique_sizes(cls, value: List[Rendition]) -> List[Rendition]:
+        # 같은 해상도는 같은 출력 파일명을 사용하므로 중복 불가
+        sizes = [(r.width, r.height) for r in value]
+        if len(sizes) != len(set(sizes)):
+            raise ValueError("rendition sizes must be unique")
+        return value
+
+
 class VideoRequest(BaseModel):
     images: List[str]
     audio: str
     subtitles: List[Subtitle]
     backgroundMusic: str
     projectId: str
+    # uniform: 균등 분할, pauses: 내레이션 쉼 구간, subtitles: 자막 경계
+    timingMode: Literal["uniform", "pauses", "subtitles"] = "uniform"
+    # 지정 시 한 번의 합성으로 여러 해상도와 썸네일을 함께 출력
+    output: Optional[OutputSpec] = None
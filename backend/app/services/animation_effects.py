@@ -2,8 +2,12 @@ import cv2
 from moviepy import editor as mp
 import numpy as np
 
+from ..core.config import VIDEO_FPS
 from ..utils.gpu import to_gpu_mat, from_gpu_mat, try_gpu_operation
 
+# 장면 순서대로 반복 적용되는 효과
+EFFECT_SEQUENCE = ["zoom_in", "pan_right", "zoom_out", "pan_left"]
+
 
 def create_animation_effect_optimized(clip, effect_type, duration):
     """최적화된 애니메이션 효과 함수"""
@@ -42,13 +46,10 @@ def create_zoom_effect(clip, effect_type, duration, w, h):
 
         result = try_gpu_operation(gpu_resize, cpu_resize)
 
-        y_start = (new_h - h) // 2
-        x_start = (new_w - w) // 2
-        cropped = result[y_start : y_start + h, x_start : x_start + w]
-        frames.append(cropped)
+        frames.append(crop_center(result, w, h))
 
     def make_frame(t):
-        frame_idx = min(int(t * 24), len(frames) - 1)
+        frame_idx = min(int(t * VIDEO_FPS), len(frames) - 1)
         return frames[frame_idx]
 
     return mp.VideoClip(make_frame, duration=duration)
@@ -76,35 +77,66 @@ def create_pan_effect(clip, effect_type, duration, w, h):
     frames = [enlarged_frame[:, offset : offset + w] for offset in offsets]
 
     def make_frame(t):
-        frame_idx = min(int(t * 24), len(frames) - 1)
+        frame_idx = min(int(t * VIDEO_FPS), len(frames) - 1)
         return frames[frame_idx]
 
     return mp.VideoClip(make_frame, duration=duration)
 
 
+def effect_for_scene(index):
+    """장면 순서에 따른 효과 선택"""
+    return EFFECT_SEQUENCE[index % len(EFFECT_SEQUENCE)]
+
+
+def letterbox_9_16(img):
+    """9:16 비율로 자르거나 위아래에 검은 여백 추가"""
+    h, w = img.shape[:2]
+    target_ratio = 9 / 16
+
+    if w / h > target_ratio:
+        # 가로로 긴 이미지는 왼쪽 9:16 영역만 사용
+        return np.ascontiguousarray(img[:, : int(h * target_ratio)])
+
+    new_h = int(w / target_ratio)
+    if new_h <= h:
+        # 세로로 긴 이미지는 위쪽 9:16 영역만 사용
+        return np.ascontiguousarray(img[:new_h])
+
+    canvas = np.zeros((new_h, w) + img.shape[2:], dtype=img.dtype)
+    y_offset = (new_h - h) // 2
+    canvas[y_offset : y_offset + h] = img
+    return canvas
+
+
+def crop_center(frame, w, h):
+    """확대된 프레임의 가운데를 원본 크기로 자르기"""
+    new_h, new_w = frame.shape[:2]
+    y_start = (new_h - h) // 2
+    x_start = (new_w - w) // 2
+    return frame[y_start : y_start + h, x_start : x_start + w]
+
+
+def effect_frame_count(duration):
+    """효과 프레임 수 (최소 1)"""
+    return max(1, int(duration * VIDEO_FPS))
+
+
+def _effect_progress(duration):
+    return np.linspace(0, 1, effect_frame_count(duration))
+
+
 def calculate_zoom_scales(effect_type, duration):
     """줌 효과의 스케일 값 계산"""
+    progress = _effect_progress(duration)
     if effect_type == "zoom_in":
-        return [
-            1.0 + (0.3 * t / duration)
-            for t in np.linspace(0, duration, int(duration * 24))
-        ]
+        return (1.0 + 0.3 * progress).tolist()
     else:  # zoom_out
-        return [
-            1.3 - (0.3 * t / duration)
-            for t in np.linspace(0, duration, int(duration * 24))
-        ]
+        return (1.3 - 0.3 * progress).tolist()
 
 
 def calculate_pan_offsets(effect_type, duration, enlarged_w, w):
     """패닝 효과의 오프셋 값 계산"""
-    offsets = []
-    for t in np.linspace(0, duration, int(duration * 24)):
-        progress = t / duration
-        smooth_progress = np.sin(progress * np.pi / 2)
-        if effect_type == "pan_right":
-            x_offset = int((enlarged_w - w) * smooth_progress)
-        else:
-            x_offset = int((enlarged_w - w) * (1 - smooth_progress))
-        offsets.append(x_offset)
-    return offsets
+    smooth_progress = np.sin(_effect_progress(duration) * np.pi / 2)
+    if effect_type == "pan_left":
+        smooth_progress = 1 - smooth_progress
+    return ((enlarged_w - w) * smooth_progress).astype(int).tolist()
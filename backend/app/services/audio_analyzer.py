@@ -0,0 +1,172 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+
+import imageio_ffmpeg
+import numpy as np
+
+from ..core.config import (
+    AUDIO_ANALYSIS_HOP,
+    AUDIO_ANALYSIS_SAMPLE_RATE,
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_MAX_ENTRIES,
+    MIN_PAUSE_DURATION,
+    MIN_SCENE_DURATION,
+    SILENCE_THRESHOLD_DB,
+)
+
+
+def decode_audio_mono(audio_path, sample_rate=AUDIO_ANALYSIS_SAMPLE_RATE):
+    """ffmpeg로 오디오를 한 번에 모노 float32 샘플로 디코딩"""
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-v",
+        "error",
+        "-i",
+        audio_path,
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    samples = np.frombuffer(result.stdout, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
+
+def compute_rms_envelope(samples, sample_rate=AUDIO_ANALYSIS_SAMPLE_RATE):
+    """고정 간격 프레임 단위 RMS 엔벨로프 계산"""
+    hop = max(1, int(sample_rate * AUDIO_ANALYSIS_HOP))
+    n_frames = len(samples) // hop
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: n_frames * hop].reshape(n_frames, hop)
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+def _cache_path(audio_path):
+    """오디오 파일 경로, 크기, 수정 시간 기반 캐시 경로"""
+    stat = os.stat(audio_path)
+    key = f"{os.path.abspath(audio_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(AUDIO_CACHE_DIR, f"{digest}.npz")
+
+
+def _evict_cache():
+    """최근에 사용되지 않은 캐시부터 삭제해 최대 개수 유지"""
+    entries = [
+        os.path.join(AUDIO_CACHE_DIR, name)
+        for name in os.listdir(AUDIO_CACHE_DIR)
+        if name.endswith(".npz") and ".tmp." not in name
+    ]
+    if len(entries) <= AUDIO_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=os.path.getmtime)
+    for path in entries[: len(entries) - AUDIO_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_rms_envelope(audio_path):
+    """캐시된 RMS 엔벨로프를 불러오고, 없으면 디코딩 후 저장"""
+    cache_path = _cache_path(audio_path)
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as data:
+                rms, hop = data["rms"], float(data["hop"])
+            # 사용 시각을 갱신해 오래된 캐시부터 삭제되도록 함
+            os.utime(cache_path)
+            return rms, hop
+        except Exception as e:
+            print(f"Warning: Failed to load audio analysis cache: {str(e)}")
+
+    rms = compute_rms_envelope(decode_audio_mono(audio_path))
+    tmp_path = None
+    try:
+        os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+        # 같은 프로세스의 여러 작업이 동시에 저장해도 겹치지 않는 임시 파일 사용
+        fd, tmp_path = tempfile.mkstemp(dir=AUDIO_CACHE_DIR, suffix=".tmp.npz")
+        with os.fdopen(fd, "wb") as tmp_file:
+            np.savez(tmp_file, rms=rms, hop=AUDIO_ANALYSIS_HOP)
+        os.replace(tmp_path, cache_path)
+        _evict_cache()
+    except Exception as e:
+        print(f"Warning: Failed to save audio analysis cache: {str(e)}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rms, AUDIO_ANALYSIS_HOP
+
+
+def detect_pauses(rms, hop):
+    """무음 구간을 찾아 각 구간의 중앙 시각 반환"""
+    if len(rms) == 0 or rms.max() <= 0:
+        return np.zeros(0)
+
+    rms_db = 20 * np.log10(rms / rms.max() + 1e-10)
+    silent = np.concatenate(([0], (rms_db < SILENCE_THRESHOLD_DB).astype(np.int8), [0]))
+    edges = np.diff(silent)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # 시작/끝의 무음은 장면 경계로 쓰지 않음
+    inner = (starts > 0) & (ends < len(rms))
+    long_enough = (ends - starts) * hop >= MIN_PAUSE_DURATION
+    mask = inner & long_enough
+    return (starts[mask] + ends[mask]) * hop / 2
+
+
+def subtitle_boundaries(subtitles):
+    """연속된 자막 사이의 경계 시각 계산"""
+    ordered = sorted(subtitles, key=lambda s: s.start)
+    return np.array(
+        [(prev.end + curr.start) / 2 for prev, curr in zip(ordered, ordered[1:])]
+    )
+
+
+def pick_boundaries(candidates, total_duration, n_scenes):
+    """균등 분할 지점에 가장 가까운 후보를 장면 경계로 선택"""
+    candidates = np.sort(np.asarray(candidates, dtype=np.float64))
+    segment = total_duration / n_scenes
+    min_scene = min(MIN_SCENE_DURATION, segment / 2)
+
+    boundaries = []
+    prev = 0.0
+    for k in range(1, n_scenes):
+        target = k * segment
+        low = prev + min_scene
+        high = total_duration - (n_scenes - k) * min_scene
+        valid = candidates[
+            (candidates >= low)
+            & (candidates <= high)
+            & (np.abs(candidates - target) <= segment / 2)
+        ]
+        if len(valid):
+            boundary = valid[np.argmin(np.abs(valid - target))]
+        else:
+            boundary = min(max(target, low), high)
+        boundaries.append(float(boundary))
+        prev = boundary
+    return boundaries
+
+
+def compute_scene_durations(
+    timing_mode, audio_path, total_duration, n_scenes, subtitles=()
+):
+    """타이밍 모드에 따라 장면별 길이 계산"""
+    if n_scenes <= 1 or timing_mode == "uniform":
+        return [total_duration / n_scenes] * n_scenes
+
+    if timing_mode == "subtitles":
+        candidates = subtitle_boundaries(subtitles)
+    else:
+        rms, hop = load_rms_envelope(audio_path)
+        candidates = detect_pauses(rms, hop)
+
+    boundaries = pick_boundaries(candidates, total_duration, n_scenes)
+    return np.diff([0.0] + boundaries + [total_duration]).tolist()
@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import numpy as np
+
+CANCEL_MARKER = "CANCELLED"
+
+
+class FrameStore:
+    """작업 폴더 내 메모리 맵 파일 기반 프레임 저장소
+
+    워커 프로세스가 프레임을 파일에 직접 쓰고, 부모 프로세스는 복사 없이
+    읽기 전용 NumPy 뷰로 읽습니다. 저장소는 작업이 끝나면 삭제됩니다.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.root, f"{name}.npy")
+
+    def create(self, name, shape, dtype=np.uint8):
+        """쓰기용 메모리 맵 배열 생성"""
+        return np.lib.format.open_memmap(
+            self._path(name), mode="w+", dtype=dtype, shape=shape
+        )
+
+    def write(self, name, array):
+        """배열 전체를 저장소에 기록"""
+        out = self.create(name, array.shape, array.dtype)
+        out[...] = array
+        out.flush()
+        del out
+
+    def open(self, name):
+        """복사 없이 읽기 전용 뷰로 열기"""
+        return np.load(self._path(name), mmap_mode="r")
+
+    def mark_cancelled(self):
+        """워커 프로세스에 취소를 알리는 표시 파일 생성"""
+        try:
+            open(os.path.join(self.root, CANCEL_MARKER), "w").close()
+        except OSError as e:
+            print(f"Warning: Failed to mark frame store cancelled: {str(e)}")
+
+    def is_cancelled(self):
+        return os.path.exists(os.path.join(self.root, CANCEL_MARKER))
+
+    def close(self):
+        """저장소 파일 삭제"""
+        shutil.rmtree(self.root, ignore_errors=True)
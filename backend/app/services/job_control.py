@@ -0,0 +1,93 @@
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """작업이 취소되었거나 제한 시간을 넘긴 경우 발생"""
+
+
+class CancelToken:
+    """작업 취소 및 제한 시간 상태를 스레드 간에 공유하는 토큰"""
+
+    def __init__(self, timeout=None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        if not self._event.is_set() and self.deadline is not None:
+            if time.monotonic() >= self.deadline:
+                self.cancel("deadline exceeded")
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """취소 상태로 전환하고 등록된 콜백 실행"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Warning: Cancel callback failed: {str(e)}")
+
+    def add_callback(self, callback):
+        """취소 시 실행할 콜백 등록 (이미 취소된 경우 즉시 실행)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def check(self):
+        """취소된 경우 JobCancelled 발생"""
+        if self.cancelled:
+            raise JobCancelled(f"Video generation {self.reason}")
+
+
+class JobRegistry:
+    """프로젝트별 실행 중인 작업 관리
+
+    같은 프로젝트로 새 작업이 시작되면 이전 작업을 취소합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def start(self, project_id, timeout=None):
+        token = CancelToken(timeout)
+        with self._lock:
+            previous = self._jobs.get(project_id)
+            self._jobs[project_id] = token
+        if previous is not None:
+            previous.cancel("superseded by a new request")
+        return token
+
+    def finish(self, project_id, token):
+        with self._lock:
+            if self._jobs.get(project_id) is token:
+                del self._jobs[project_id]
+
+    def cancel(self, project_id, reason="cancelled by user"):
+        with self._lock:
+            token = self._jobs.get(project_id)
+        if token is None:
+            return False
+        token.cancel(reason)
+        return True
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,234 @@
+import math
+import os
+import subprocess
+
+import imageio_ffmpeg
+
+from ..core.config import AUDIO_CODEC, AUDIO_FPS, VIDEO_CODEC, VIDEO_FPS
+from .job_control import CancelToken
+
+
+def build_filter_graph(renditions, thumbnails, duration):
+    """합성 프레임 하나를 여러 출력으로 나누는 ffmpeg 필터 그래프 생성"""
+    n_outputs = len(renditions) + (2 if thumbnails else 0)
+    split_labels = [f"[s{i}]" for i in range(n_outputs)]
+    filters = [f"[0:v]split={n_outputs}{''.join(split_labels)}"]
+
+    for i, rendition in enumerate(renditions):
+        w, h = rendition.width, rendition.height
+        filters.append(
+            f"[s{i}]scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p[r{i}]"
+        )
+
+    if thumbnails:
+        poster_idx = len(renditions)
+        sprite_idx = poster_idx + 1
+        poster_time = min(max(thumbnails.posterTime, 0.0), max(duration - 0.1, 0.0))
+        n_tiles = max(1, math.ceil(duration / thumbnails.spriteInterval))
+        rows = math.ceil(n_tiles / thumbnails.spriteColumns)
+        filters.append(
+            f"[s{poster_idx}]trim=start={poster_time:.3f},setpts=PTS-STARTPTS[poster]"
+        )
+        filters.append(
+            f"[s{sprite_idx}]fps=1/{thumbnails.spriteInterval},"
+            f"scale={thumbnails.spriteWidth}:-2,"
+            f"tile={thumbnails.spriteColumns}x{rows}[sprite]"
+        )
+
+    return ";".join(filters)
+
+
+def _encode_audio(final_video, temp_dir, base_name, cancel_token):
+    """오디오를 한 번만 인코딩해 모든 출력에서 공유
+
+    믹싱된 PCM을 직접 ffmpeg로 전달해 취소 시 인코더를 종료할 수 있게 합니다.
+    """
+    audio = final_video.audio
+    audio_path = os.path.join(temp_dir, f"{base_name}_audio.m4a")
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "s16le",
+        "-ar",
+        str(AUDIO_FPS),
+        "-ac",
+        str(audio.nchannels),
+        "-i",
+        "-",
+        "-c:a",
+        AUDIO_CODEC,
+        audio_path,
+    ]
+    chunks = (
+        chunk.astype("int16").tobytes()
+        for chunk in audio.iter_chunks(
+            fps=AUDIO_FPS, quantize=True, nbytes=2, chunksize=50000
+        )
+    )
+    log_path = os.path.join(temp_dir, f"{base_name}_audio_ffmpeg.log")
+    _pipe_to_ffmpeg(cmd, chunks, log_path, [audio_path], cancel_token)
+    return audio_path
+
+
+def _input_args(final_video, audio_path):
+    """표준 입력 raw 프레임과 오디오 파일을 받는 ffmpeg 입력 인자"""
+    w, h = final_video.size
+    return [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "rawvideo",
+        "-vcodec",
+        "rawvideo",
+        "-s",
+        f"{w}x{h}",
+        "-pix_fmt",
+        "rgb24",
+        "-r",
+        str(VIDEO_FPS),
+        "-i",
+        "-",
+        "-i",
+        audio_path,
+    ]
+
+
+def _remove_outputs(output_paths):
+    for path in output_paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"Warning: Failed to remove partial output {path}: {str(e)}")
+
+
+def _video_chunks(final_video):
+    for frame in final_video.iter_frames(fps=VIDEO_FPS, dtype="uint8"):
+        yield frame.tobytes()
+
+
+def _pipe_to_ffmpeg(cmd, chunks, log_path, output_paths, cancel_token):
+    """raw 데이터를 ffmpeg 표준 입력으로 전달 (취소 시 ffmpeg를 즉시 종료)"""
+    with open(log_path, "wb") as log_file:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+        )
+        cancel_token.add_callback(proc.kill)
+        try:
+            try:
+                for chunk in chunks:
+                    cancel_token.check()
+                    proc.stdin.write(chunk)
+                proc.stdin.close()
+            except BrokenPipeError:
+                # ffmpeg가 먼저 종료된 경우 아래에서 로그와 함께 오류 처리
+                pass
+            proc.wait()
+            cancel_token.check()
+
+            if proc.returncode != 0:
+                with open(log_path, "r", errors="replace") as log_reader:
+                    raise ValueError(f"ffmpeg encoding failed: {log_reader.read()}")
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            _remove_outputs(output_paths)
+            raise
+        finally:
+            cancel_token.remove_callback(proc.kill)
+
+
+def encode_video(final_video, output_path, temp_dir, cancel_token=None):
+    """단일 비디오 파일 인코딩"""
+    cancel_token = cancel_token or CancelToken()
+    base_name = os.path.splitext(os.path.basename(output_path))[0]
+    audio_path = _encode_audio(final_video, temp_dir, base_name, cancel_token)
+
+    cmd = _input_args(final_video, audio_path) + [
+        "-map",
+        "0:v",
+        "-map",
+        "1:a",
+        "-c:v",
+        VIDEO_CODEC,
+        "-preset",
+        "faster",
+        "-threads",
+        "8",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "copy",
+        "-shortest",
+        output_path,
+    ]
+    log_path = os.path.join(temp_dir, f"{base_name}_ffmpeg.log")
+    _pipe_to_ffmpeg(
+        cmd, _video_chunks(final_video), log_path, [output_path], cancel_token
+    )
+
+
+def encode_renditions(
+    final_video, output_spec, output_dir, base_name, temp_dir, cancel_token=None
+):
+    """합성된 프레임을 한 번만 생성해 모든 렌디션과 썸네일로 인코딩"""
+    cancel_token = cancel_token or CancelToken()
+    renditions = output_spec.renditions
+    thumbnails = output_spec.thumbnails
+
+    audio_path = _encode_audio(final_video, temp_dir, base_name, cancel_token)
+
+    cmd = _input_args(final_video, audio_path) + [
+        "-filter_complex",
+        build_filter_graph(renditions, thumbnails, final_video.duration),
+    ]
+
+    artifacts = {"renditions": []}
+    output_paths = []
+    for i, rendition in enumerate(renditions):
+        filename = f"{base_name}_{rendition.width}x{rendition.height}.mp4"
+        output_paths.append(os.path.join(output_dir, filename))
+        cmd += [
+            "-map",
+            f"[r{i}]",
+            "-map",
+            "1:a",
+            "-c:v",
+            VIDEO_CODEC,
+            "-preset",
+            "faster",
+            "-c:a",
+            "copy",
+            "-movflags",
+            "+faststart",
+            "-shortest",
+            output_paths[-1],
+        ]
+        artifacts["renditions"].append(
+            {"width": rendition.width, "height": rendition.height, "file": filename}
+        )
+
+    if thumbnails:
+        poster_filename = f"{base_name}_poster.jpg"
+        sprite_filename = f"{base_name}_sprite.jpg"
+        output_paths.append(os.path.join(output_dir, poster_filename))
+        cmd += ["-map", "[poster]", "-frames:v", "1", "-q:v", "2", output_paths[-1]]
+        output_paths.append(os.path.join(output_dir, sprite_filename))
+        cmd += ["-map", "[sprite]", "-frames:v", "1", "-q:v", "3", output_paths[-1]]
+        artifacts["poster"] = poster_filename
+        artifacts["sprite"] = sprite_filename
+
+    log_path = os.path.join(temp_dir, f"{base_name}_ffmpeg.log")
+    _pipe_to_ffmpeg(
+        cmd, _video_chunks(final_video), log_path, output_paths, cancel_token
+    )
+    return artifacts
@@ -0,0 +1,68 @@
+import cv2
+
+from .animation_effects import (
+    calculate_pan_offsets,
+    calculate_zoom_scales,
+    crop_center,
+    letterbox_9_16,
+)
+from .frame_store import FrameStore
+
+
+def render_scene(store_root, index, src_path, duration, effect_type):
+    """워커 프로세스에서 장면 프레임을 렌더링해 저장소에 기록
+
+    부모로는 프레임 대신 저장소 내 이름과 메타데이터만 반환하며,
+    작업이 취소되면 None을 반환합니다.
+    """
+    store = FrameStore(store_root)
+    if store.is_cancelled():
+        return None
+
+    img = cv2.imread(src_path)
+    if img is None:
+        print(f"Warning: Failed to load image: {src_path}")
+        return None
+
+    source = letterbox_9_16(img)
+    h, w = source.shape[:2]
+    source_name = f"scene{index}_source"
+    store.write(source_name, source)
+
+    result = {
+        "effect": effect_type,
+        "duration": duration,
+        "size": (w, h),
+        "source": source_name,
+    }
+
+    if effect_type in ["zoom_in", "zoom_out"]:
+        scales = calculate_zoom_scales(effect_type, duration)
+        frames_name = f"scene{index}_frames"
+        frames = store.create(frames_name, (len(scales), h, w, 3))
+        for k, scale in enumerate(scales):
+            if store.is_cancelled():
+                del frames
+                return None
+            new_h = int(h * scale)
+            new_w = int(w * scale)
+            resized = cv2.resize(
+                source, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4
+            )
+            frames[k] = crop_center(resized, w, h)
+        frames.flush()
+        del frames
+        result["frames"] = frames_name
+
+    elif effect_type in ["pan_right", "pan_left"]:
+        enlarged_w = int(w * 1.4)
+        enlarged = cv2.resize(
+            source, (enlarged_w, h), interpolation=cv2.INTER_LANCZOS4
+        )
+        enlarged_name = f"scene{index}_enlarged"
+        store.write(enlarged_name, enlarged)
+
+        result["enlarged"] = enlarged_name
+        result["offsets"] = calculate_pan_offsets(effect_type, duration, enlarged_w, w)
+
+    return result
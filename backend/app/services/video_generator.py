@@ -1,10 +1,28 @@
 import os
 import shutil
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+import multiprocessing
 from moviepy import editor as mp
 import cv2
-import numpy as np
 
-from ..core.config import NEXTJS_PUBLIC_DIR, VIDEO_FPS
+from ..core.config import (
+    FRAME_STORE_DIRNAME,
+    NEXTJS_PUBLIC_DIR,
+    SCENE_WORKERS,
+    VIDEO_FPS,
+)
+from .animation_effects import (
+    calculate_pan_offsets,
+    calculate_zoom_scales,
+    crop_center,
+    effect_for_scene,
+    letterbox_9_16,
+)
+from .audio_analyzer import compute_scene_durations
+from .frame_store import FrameStore
+from .job_control import CancelToken, JobCancelled
+from .rendition_writer import encode_renditions, encode_video
+from .scene_worker import render_scene
 from .subtitle_processor import create_styled_text_clip, split_subtitle
 
 # Metal 가속 설정
@@ -14,42 +32,55 @@ cv2.ocl.setUseOpenCL(True)
 
 
 class VideoGenerator:
-    def __init__(self, request, temp_dir="temp"):
+    def __init__(self, request, temp_dir="temp", cancel_token=None):
         self.request = request
         self.temp_dir = temp_dir
+        self.cancel_token = cancel_token or CancelToken()
+        self.frame_store = None
         os.makedirs(temp_dir, exist_ok=True)
 
     def generate(self):
         """비디오 생성 프로세스 실행"""
         try:
             # 내레이션 처리
+            self.cancel_token.check()
             narration = self._process_narration()
             narration_duration = narration.duration
-            clip_duration = narration_duration / len(self.request.images)
+            clip_durations = self._compute_clip_durations(narration_duration)
 
             # 이미지 처리
-            image_clips = self._process_images(clip_duration)
+            self.cancel_token.check()
+            image_clips = self._process_images(clip_durations)
             if not image_clips:
                 raise ValueError("No valid image clips were generated")
 
             # 비디오 생성
+            self.cancel_token.check()
             video = mp.concatenate_videoclips(image_clips, method="compose")
 
             # 자막 처리
             text_clips = self._process_subtitles(video)
 
             # 최종 비디오 합성
+            self.cancel_token.check()
             final_video = self._compose_final_video(
                 video, text_clips, narration, narration_duration
             )
 
             # 비디오 저장
+            self.cancel_token.check()
             return self._save_video(final_video)
 
         except Exception as e:
             print(f"Error in video generation: {str(e)}")
-            self._cleanup()
             raise
+        finally:
+            # 프레임 저장소는 인코딩이 끝난 뒤에만 해제
+            if self.frame_store is not None:
+                self.cancel_token.remove_callback(self.frame_store.mark_cancelled)
+                self.frame_store.close()
+                self.frame_store = None
+            self._cleanup()
 
     def _process_narration(self):
         """내레이션 오디오 처리"""
@@ -60,18 +91,39 @@ class VideoGenerator:
             if not os.path.exists(narration_path):
                 raise FileNotFoundError(f"Narration file not found: {narration_path}")
 
+            self.narration_path = narration_path
             temp_narration_path = os.path.join(self.temp_dir, "narration.mp3")
             shutil.copy2(narration_path, temp_narration_path)
             return mp.AudioFileClip(temp_narration_path)
         except Exception as e:
             raise ValueError(f"Failed to process narration: {str(e)}")
 
-    def _process_images(self, clip_duration):
+    def _compute_clip_durations(self, narration_duration):
+        """타이밍 모드에 따른 이미지별 클립 길이 계산"""
+        n_scenes = len(self.request.images)
+        try:
+            return compute_scene_durations(
+                self.request.timingMode,
+                self.narration_path,
+                narration_duration,
+                n_scenes,
+                self.request.subtitles,
+            )
+        except Exception as e:
+            print(f"Warning: Scene timing analysis failed, using uniform: {str(e)}")
+            return [narration_duration / n_scenes] * n_scenes
+
+    def _process_images(self, clip_durations):
         """이미지 병렬 처리"""
+        if SCENE_WORKERS > 1:
+            return self._process_images_in_workers(clip_durations)
+
         try:
             image_clips = []
             for i, img_path in enumerate(self.request.images):
+                self.cancel_token.check()
                 print(f"Processing image {i}: {img_path}")
+                clip_duration = clip_durations[i]
                 src_path = os.path.join(NEXTJS_PUBLIC_DIR, img_path.lstrip("/"))
                 if not os.path.exists(src_path):
                     print(f"Warning: Image file not found: {src_path}")
@@ -97,40 +149,103 @@ class VideoGenerator:
                     continue
 
                 # 효과 적용
-                effects = ["zoom_in", "pan_right", "zoom_out", "pan_left"]
-                effect_type = effects[i % len(effects)]
-                clip = self._apply_effect(clip, effect_type, clip_duration)
+                clip = self._apply_effect(clip, effect_for_scene(i), clip_duration)
 
                 image_clips.append(clip)
 
             return image_clips
+        except JobCancelled:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to process images: {str(e)}")
 
-    def _create_video_clip(self, img_gpu, duration):
-        """9:16 비율의 비디오 클립 생성"""
+    def _process_images_in_workers(self, clip_durations):
+        """워커 프로세스에서 장면을 렌더링하고 프레임 저장소에서 읽기"""
         try:
-            h, w = (
-                img_gpu.get().shape[:2]
-                if isinstance(img_gpu, cv2.UMat)
-                else img_gpu.shape[:2]
+            self.frame_store = FrameStore(
+                os.path.join(self.temp_dir, FRAME_STORE_DIRNAME)
             )
-            target_ratio = 9 / 16
-            current_ratio = w / h
-
-            if current_ratio > target_ratio:
-                new_w = int(h * target_ratio)
-                bg_w = new_w
-                bg_h = h
-                x_offset = 0
-                y_offset = 0
-            else:
-                new_h = int(w / target_ratio)
-                bg_w = w
-                bg_h = new_h
-                x_offset = 0
-                y_offset = (new_h - h) // 2 if new_h > h else 0
+            self.cancel_token.add_callback(self.frame_store.mark_cancelled)
+
+            futures = []
+            with ProcessPoolExecutor(
+                max_workers=SCENE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                for i, img_path in enumerate(self.request.images):
+                    print(f"Processing image {i}: {img_path}")
+                    src_path = os.path.join(NEXTJS_PUBLIC_DIR, img_path.lstrip("/"))
+                    if not os.path.exists(src_path):
+                        print(f"Warning: Image file not found: {src_path}")
+                        continue
+                    futures.append(
+                        executor.submit(
+                            render_scene,
+                            self.frame_store.root,
+                            i,
+                            src_path,
+                            clip_durations[i],
+                            effect_for_scene(i),
+                        )
+                    )
+
+                # 워커를 기다리는 동안에도 취소와 제한 시간 확인
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(
+                        pending, timeout=0.5, return_when=FIRST_EXCEPTION
+                    )
+                    failed = [f for f in done if f.exception() is not None]
+                    if failed or self.cancel_token.cancelled:
+                        for future in pending:
+                            future.cancel()
+                    if failed:
+                        # 실행 중인 다른 워커도 즉시 중단하도록 표시
+                        self.frame_store.mark_cancelled()
+                        raise failed[0].exception()
+                    self.cancel_token.check()
+                scenes = [future.result() for future in futures]
+
+            return [
+                self._clip_from_store(scene) for scene in scenes if scene is not None
+            ]
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to process images: {str(e)}")
+
+    def _clip_from_store(self, scene):
+        """저장소의 프레임을 복사 없이 참조하는 클립 생성"""
+        duration = scene["duration"]
+
+        if "frames" in scene:
+            frames = self.frame_store.open(scene["frames"])
+
+            def make_frame(t):
+                frame_idx = min(int(t * VIDEO_FPS), len(frames) - 1)
+                return frames[frame_idx]
+
+            return mp.VideoClip(make_frame, duration=duration)
+
+        if "enlarged" in scene:
+            enlarged_frame = self.frame_store.open(scene["enlarged"])
+            w, _ = scene["size"]
+            offsets = scene["offsets"]
 
+            def make_frame(t):
+                frame_idx = min(int(t * VIDEO_FPS), len(offsets) - 1)
+                x_offset = offsets[frame_idx]
+                return enlarged_frame[:, x_offset : x_offset + w]
+
+            return mp.VideoClip(make_frame, duration=duration)
+
+        return mp.ImageClip(self.frame_store.open(scene["source"])).set_duration(
+            duration
+        )
+
+    def _create_video_clip(self, img_gpu, duration):
+        """9:16 비율의 비디오 클립 생성"""
+        try:
             # GPU에서 이미지 처리
             try:
                 if isinstance(img_gpu, cv2.UMat):
@@ -141,14 +256,9 @@ class VideoGenerator:
                 print(f"Warning: GPU processing failed: {str(e)}")
                 result = img_gpu
 
-            # MoviePy 클립 생성
-            clip = mp.ImageClip(result)
-            bg_clip = mp.ColorClip(size=(bg_w, bg_h), color=(0, 0, 0))
-
-            # 클립 합성
-            clip = clip.set_position((x_offset, y_offset))
-            final_clip = mp.CompositeVideoClip([bg_clip, clip])
-            return final_clip.set_duration(duration)
+            # 워커 경로와 같은 9:16 프레임으로 MoviePy 클립 생성
+            clip = mp.ImageClip(letterbox_9_16(result))
+            return clip.set_duration(duration)
 
         except Exception as e:
             print(f"Error creating video clip: {str(e)}")
@@ -160,20 +270,14 @@ class VideoGenerator:
 
         if effect_type in ["zoom_in", "zoom_out"]:
             # 미리 스케일 값 계산
-            scales = []
-            for t in np.linspace(0, duration, int(duration * 24)):
-                progress = t / duration
-                if effect_type == "zoom_in":
-                    scale = 1.0 + (0.3 * progress)
-                else:
-                    scale = 1.3 - (0.3 * progress)
-                scales.append(scale)
+            scales = calculate_zoom_scales(effect_type, duration)
 
             frames = []
             frame = clip.get_frame(0)
             frame_gpu = cv2.UMat(frame)
 
             for scale in scales:
+                self.cancel_token.check()
                 new_h = int(h * scale)
                 new_w = int(w * scale)
                 try:
@@ -187,13 +291,10 @@ class VideoGenerator:
                         frame, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4
                     )
 
-                y_start = (new_h - h) // 2
-                x_start = (new_w - w) // 2
-                cropped = result[y_start : y_start + h, x_start : x_start + w]
-                frames.append(cropped)
+                frames.append(crop_center(result, w, h))
 
             def make_frame(t):
-                frame_idx = min(int(t * 24), len(frames) - 1)
+                frame_idx = min(int(t * VIDEO_FPS), len(frames) - 1)
                 return frames[frame_idx]
 
             return mp.VideoClip(make_frame, duration=duration)
@@ -213,13 +314,10 @@ class VideoGenerator:
                     frame, (enlarged_w, h), interpolation=cv2.INTER_LANCZOS4
                 )
 
+            offsets = calculate_pan_offsets(effect_type, duration, enlarged_w, w)
+
             def make_frame(t):
-                progress = t / duration
-                smooth_progress = np.sin(progress * np.pi / 2)
-                if effect_type == "pan_right":
-                    x_offset = int((enlarged_w - w) * smooth_progress)
-                else:
-                    x_offset = int((enlarged_w - w) * (1 - smooth_progress))
+                x_offset = offsets[min(int(t * VIDEO_FPS), len(offsets) - 1)]
                 return enlarged_frame[:, x_offset : x_offset + w]
 
             return mp.VideoClip(make_frame, duration=duration)
@@ -235,6 +333,7 @@ class VideoGenerator:
                 chunk_duration = (subtitle.end - subtitle.start) / len(chunks)
 
                 for i, chunk in enumerate(chunks):
+                    self.cancel_token.check()
                     start_time = subtitle.start + (i * chunk_duration)
                     try:
                         txt_clip = create_styled_text_clip(
@@ -247,6 +346,8 @@ class VideoGenerator:
                         continue
 
             return text_clips
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Warning: Failed to process some subtitles: {str(e)}")
             return []
@@ -281,6 +382,9 @@ class VideoGenerator:
 
     def _save_video(self, final_video):
         """비디오 파일 저장"""
+        if self.request.output is not None:
+            return self._save_renditions(final_video)
+
         try:
             output_filename = f"{self.request.projectId}_final_video.mp4"
             output_dir = os.path.join(
@@ -289,21 +393,54 @@ class VideoGenerator:
             os.makedirs(output_dir, exist_ok=True)
             output_path = os.path.join(output_dir, output_filename)
 
-            final_video.write_videofile(
-                output_path,
-                fps=VIDEO_FPS,
-                codec="h264_videotoolbox",
-                audio_codec="aac",
-                preset="faster",
-                threads=8,
-            )
+            encode_video(final_video, output_path, self.temp_dir, self.cancel_token)
 
             return {
                 "videoUrl": f"/outputs/{self.request.projectId}/video/{output_filename}"
             }
+        except JobCancelled:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to save video: {str(e)}")
 
+    def _save_renditions(self, final_video):
+        """한 번의 합성 패스로 모든 렌디션과 썸네일 저장"""
+        try:
+            project_id = self.request.projectId
+            output_dir = os.path.join(NEXTJS_PUBLIC_DIR, "outputs", project_id, "video")
+            os.makedirs(output_dir, exist_ok=True)
+
+            artifacts = encode_renditions(
+                final_video,
+                self.request.output,
+                output_dir,
+                f"{project_id}_final_video",
+                self.temp_dir,
+                self.cancel_token,
+            )
+
+            url_prefix = f"/outputs/{project_id}/video"
+            renditions = [
+                {
+                    "width": r["width"],
+                    "height": r["height"],
+                    "url": f"{url_prefix}/{r['file']}",
+                }
+                for r in artifacts["renditions"]
+            ]
+            response = {
+                "videoUrl": renditions[0]["url"] if renditions else None,
+                "renditions": renditions,
+            }
+            if "poster" in artifacts:
+                response["posterUrl"] = f"{url_prefix}/{artifacts['poster']}"
+                response["spriteUrl"] = f"{url_prefix}/{artifacts['sprite']}"
+            return response
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to save renditions: {str(e)}")
+
     def _cleanup(self):
         """임시 파일 정리"""
         try: